@@ -3,21 +3,174 @@ Calendar Manager Module
 
 This module contains the Calendar class which manages a collection of events.
 It handles adding, retrieving, and deleting events, as well as finding available time slots.
-Data is persisted to a JSON file.
+Data is persisted to a JSON Lines file that changes are appended to.
 """
 
+import atexit
+import hashlib
 import json
 import os
-from datetime import datetime, timedelta
+import queue
+import threading
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta
+from operator import attrgetter
 
-from event import Event
+from event import Event, from_epoch_micros, to_epoch_micros
+
+# orjson is an optional, much faster JSON library. The calendar works without it,
+# falling back to the standard library json module with identical output.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(data):
+    """
+    Serialize data to compact, single-line JSON bytes.
+    
+    Args:
+        data: The JSON-compatible data to serialize
+        
+    Returns:
+        bytes: UTF-8 encoded JSON without newlines
+    """
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def _loads(raw):
+    """
+    Parse JSON bytes back into Python data.
+    
+    Args:
+        raw (bytes): UTF-8 encoded JSON
+        
+    Returns:
+        The parsed data
+        
+    Raises:
+        json.JSONDecodeError: If the data is not valid JSON
+            (orjson.JSONDecodeError is a subclass of it)
+    """
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _record_key(record):
+    """
+    Identify the event a stored record refers to, without building the Event.
+    
+    Naive times in the ISO string format (as saved by older versions) are
+    converted to the same integer form, so that additions and deletions match
+    whichever format they use. Times with a time zone are only ever stored as
+    ISO strings, and are compared as datetimes.
+    
+    Args:
+        record (dict): An event record read from the data file
+        
+    Returns:
+        tuple: The event's title, start time and end time (in microseconds for
+            naive times, as datetimes for times with a time zone)
+    """
+    if "s" in record:
+        return (record["title"], record["s"], record["e"])
+    start_time = datetime.fromisoformat(record["start_time"])
+    end_time = datetime.fromisoformat(record["end_time"])
+    if start_time.tzinfo is None and end_time.tzinfo is None:
+        return (record["title"], to_epoch_micros(start_time), to_epoch_micros(end_time))
+    return (record["title"], start_time, end_time)
+
+
+class DayBucket:
+    """
+    Holds the events scheduled on a single date, sorted by start time.
+    
+    Alongside the events we keep parallel lists of their start and end times
+    (as the integer start_ts and end_ts timestamps). A binary search can run on
+    the start times directly instead of building that list on every insert, and
+    scans over the day's schedule compare plain integers without touching the
+    Event objects. Always change the lists together using insert() and pop().
+    """
+    
+    def __init__(self, events=None):
+        """
+        Create a bucket, optionally from a list of events.
+        
+        Args:
+            events (list, optional): Event objects already sorted by start time
+        """
+        self.events = events if events is not None else []
+        self.starts = [event.start_ts for event in self.events]
+        self.ends = [event.end_ts for event in self.events]
+    
+    def __len__(self):
+        """
+        Returns:
+            int: The number of events in the bucket
+        """
+        return len(self.events)
+    
+    def insert(self, event):
+        """
+        Insert an event, keeping the lists sorted by start time.
+        
+        Args:
+            event (Event): The event to insert
+        """
+        position = bisect_left(self.starts, event.start_ts)
+        self.starts.insert(position, event.start_ts)
+        self.ends.insert(position, event.end_ts)
+        self.events.insert(position, event)
+    
+    def pop(self, index):
+        """
+        Remove and return the event at the given position.
+        
+        Args:
+            index (int): 0-based position of the event
+            
+        Returns:
+            Event: The removed event
+        """
+        self.starts.pop(index)
+        self.ends.pop(index)
+        return self.events.pop(index)
+    
+    def first_overlap(self, start_ts, end_ts):
+        """
+        Find the earliest event in the bucket that overlaps a time range.
+        
+        Only events starting before the range ends can overlap it. The stored
+        events never overlap each other, so their end times are sorted too:
+        walking back from the last of them, we stop at the first one that ends
+        by the range's start (usually straight away).
+        
+        Args:
+            start_ts (int): Start of the range, in microseconds since the epoch
+            end_ts (int): End of the range, in microseconds since the epoch
+            
+        Returns:
+            int: Position of the earliest overlapping event, or -1 if there is none
+        """
+        ends = self.ends
+        position = bisect_left(self.starts, end_ts)
+        first = position
+        while first > 0 and ends[first - 1] > start_ts:
+            first -= 1
+        return first if first < position else -1
 
 
 class Calendar:
     """
     Manages a collection of events and provides calendar operations.
     
-    The calendar stores all events in memory and persists them to a JSON file.
+    The calendar stores all events in memory and persists them to a JSON Lines file.
     It prevents scheduling conflicts by checking for overlapping events.
     
     Optimization: Events are stored in a dictionary indexed by date, which allows
@@ -26,18 +179,57 @@ class Calendar:
     where n is total events in the calendar.
     """
     
-    # The file where we'll save our events
-    DATA_FILE = "calendar_data.json"
+    # The file where we'll save our events, and the single-array JSON file used
+    # by older versions, which is converted automatically when found
+    DATA_FILE = "calendar_data.jsonl"
+    LEGACY_DATA_FILE = "calendar_data.json"
+    
+    # Compact the data file once more than this fraction of its lines are dead
+    COMPACT_RATIO = 0.5
     
-    def __init__(self):
+    # The working hours searched by find_next_available_slot (8 AM to 6 PM)
+    DAY_START_TIME = time(8, 0)
+    DAY_END_TIME = time(18, 0)
+    
+    def __init__(self, write_behind=False):
         """
         Initialize the calendar and load any existing events from storage.
         
         We use a dictionary where keys are date strings (YYYY-MM-DD) and values
-        are lists of events for that date, kept sorted by start time.
+        are DayBuckets holding the events for that date, kept sorted by start time.
+        
+        Args:
+            write_behind (bool): If True, changes are written to the data file by
+                a background thread so callers never wait on disk I/O. Call
+                close() (also run automatically at exit) to finish writing.
         """
-        # Dictionary structure: { "2026-01-06": [event1, event2, ...], ... }
+        # Dictionary structure: { "2026-01-06": DayBucket([event1, event2, ...]), ... }
         self.events_by_date = {}
+        
+        # Changes not yet appended to the data file, so several mutations can
+        # share a single file write
+        self._pending_records = []
+        self._batch_depth = 0
+        
+        # Lines in the data file, and how many of them no longer describe a live
+        # event; used to decide when to compact it
+        self._log_records = 0
+        self._dead_records = 0
+        self._log_needs_rewrite = False
+        
+        # Digest of the last bytes written, used to skip rewriting identical data
+        self._last_serialized_hash = None
+        
+        # Guards the events and the data file between this thread and the
+        # write-behind thread. Reentrant because flush() calls save_events().
+        self._lock = threading.RLock()
+        
+        # Write-behind state: the queue holds at most one save request, since a
+        # pending request already covers any changes made after it was queued
+        self._write_behind = write_behind
+        self._save_queue = queue.Queue(maxsize=1)
+        self._save_thread = None
+        
         self.load_events()
     
     def _get_date_key(self, date_obj):
@@ -45,11 +237,15 @@ class Calendar:
         Convert a date object to a string key for dictionary storage.
         
         Args:
-            date_obj: A date or datetime object
+            date_obj: A date or datetime object, or an Event (keyed by its start date)
             
         Returns:
             str: Date in YYYY-MM-DD format
         """
+        # Events already carry their key, computed once when start_time is set
+        if hasattr(date_obj, '_date_key'):
+            return date_obj._date_key
+        
         # Handle both date and datetime objects by extracting just the date portion
         if hasattr(date_obj, 'date'):
             return date_obj.date().isoformat()
@@ -59,75 +255,303 @@ class Calendar:
         """
         Insert an event into the correct position to maintain sorted order by start time.
         
-        Using binary search (bisect) for O(log m) insertion position finding,
-        where m is the number of events on that date.
+        Using binary search (bisect) on the bucket's start times for O(log m)
+        insertion position finding, where m is the number of events on that date.
         
         Args:
             date_key (str): The date key in the dictionary
             event (Event): The event to insert
         """
-        from bisect import bisect_left
-        
-        if date_key not in self.events_by_date:
-            self.events_by_date[date_key] = []
-        
-        events_list = self.events_by_date[date_key]
-        
-        # Find the insertion point using binary search on start times
-        # This keeps the list sorted by start_time automatically
-        start_times = [e.start_time for e in events_list]
-        insert_pos = bisect_left(start_times, event.start_time)
-        events_list.insert(insert_pos, event)
+        bucket = self.events_by_date.get(date_key)
+        if bucket is None:
+            bucket = self.events_by_date[date_key] = DayBucket()
+        bucket.insert(event)
     
     def load_events(self):
         """
-        Load events from the JSON file if it exists.
+        Load events from the data file if it exists.
         
         This allows events to persist between program runs.
         If the file doesn't exist or is invalid, we start with an empty calendar.
         Events are organized into the dictionary structure for efficient lookups.
+        
+        The data file is a log: each line holds one added event, and a line
+        with "op": "del" records the deletion of a matching earlier event.
+        Replaying it gives the live events, which are grouped by date in a
+        single pass and each date's list is then sorted once. A calendar saved
+        by older versions as one JSON array (LEGACY_DATA_FILE) is converted to
+        the log format the first time it is loaded.
         """
+        legacy = False
         if os.path.exists(self.DATA_FILE):
-            try:
-                with open(self.DATA_FILE, "r") as file:
-                    data = json.load(file)
-                    
-                    # Convert each dictionary back to an Event object and organize by date
-                    event_count = 0
-                    for event_data in data:
-                        event = Event.from_dict(event_data)
-                        date_key = self._get_date_key(event.start_time)
-                        self._insert_sorted(date_key, event)
-                        event_count += 1
-                        
-                print(f"Loaded {event_count} existing event(s) from storage.")
-            except (json.JSONDecodeError, KeyError) as error:
-                # If the file is corrupted, start fresh
-                print(f"Warning: Could not load saved events ({error}). Starting fresh.")
-                self.events_by_date = {}
+            path = self.DATA_FILE
+        elif os.path.exists(self.LEGACY_DATA_FILE):
+            path = self.LEGACY_DATA_FILE
+            legacy = True
         else:
             print("No existing calendar data found. Starting with empty calendar.")
+            return
+        
+        try:
+            with open(path, "rb") as file:
+                if legacy:
+                    records = _loads(file.read())
+                else:
+                    # Parsed lazily, one line at a time, as the log is replayed
+                    records = self._read_log(file)
+                
+                # Replay the log, cancelling each added record against later deletions.
+                # Records are matched on their title and times.
+                live_records = {}
+                record_count = 0
+                dead_count = 0
+                for record in records:
+                    record_count += 1
+                    key = _record_key(record)
+                    if record.get("op") == "del":
+                        matches = live_records.get(key)
+                        if matches:
+                            matches.pop()
+                            # The deletion and the addition it cancels are both dead
+                            dead_count += 2
+                        else:
+                            dead_count += 1
+                    else:
+                        live_records.setdefault(key, []).append(record)
+                
+                # Only the records that survived the replay become events,
+                # built together in one pass
+                events = Event.from_dicts(
+                    record for matches in live_records.values() for record in matches
+                )
+            
+            # Group the live events by date
+            events_by_date = defaultdict(list)
+            for event in events:
+                events_by_date[self._get_date_key(event)].append(event)
+            
+            # Sort each date's events by start time once
+            self.events_by_date = {}
+            for date_key, events_list in events_by_date.items():
+                events_list.sort(key=attrgetter("start_ts"))
+                self.events_by_date[date_key] = DayBucket(events_list)
+            
+            self._log_records = record_count
+            self._dead_records = dead_count
+            print(f"Loaded {len(events)} existing event(s) from storage.")
+        except (json.JSONDecodeError, KeyError) as error:
+            # If the file is corrupted, start fresh
+            print(f"Warning: Could not load saved events ({error}). Starting fresh.")
+            self.events_by_date = {}
+            # Replace the unreadable file on the next save instead of appending to it
+            self._log_needs_rewrite = True
+            return
+        
+        # Convert a legacy file, or drop an incomplete last line, by rewriting the log
+        try:
+            if legacy or self._log_needs_rewrite:
+                self.save_events()
+            else:
+                self.compact()
+        except OSError as error:
+            # The events are loaded, so carry on; the next save rewrites the file
+            print(f"Warning: Could not rewrite the calendar file ({error}).")
+            self._log_needs_rewrite = True
+    
+    def _read_log(self, file):
+        """
+        Read the records from the data file one line at a time.
+        
+        This is a generator, so only one parsed record needs to be in memory at
+        once rather than the whole file.
+        
+        A final line without a newline is the remains of a write that was
+        interrupted, so it is ignored and the log is rewritten on load.
+        
+        Args:
+            file: The data file, opened in binary mode
+            
+        Yields:
+            dict: Each record in the order it was written
+        """
+        for line in file:
+            if not line.endswith(b"\n"):
+                print("Warning: Ignoring an incomplete change at the end of the calendar file.")
+                self._log_needs_rewrite = True
+                return
+            if line.strip():
+                yield _loads(line)
     
     def save_events(self):
         """
-        Save all events to the JSON file.
+        Save all events to the data file, replacing its contents.
+        
+        The file is rewritten with one line per event, dropping deleted events
+        and the lines that recorded their deletion. Any changes waiting to be
+        appended are included, since they are already part of the events.
         
-        This is called after any change to ensure data persistence.
-        We flatten the dictionary structure back to a list for simple JSON storage.
+        The data is written to a temporary file which then replaces the real one,
+        so a crash mid-write can never leave a half-written calendar behind.
+        If the data is identical to what was last written, nothing is written.
+        
+        If writing fails, the file and the record of what it contains are left
+        as they were, so the next save tries the full rewrite again.
+        
+        Raises:
+            OSError: If the data file could not be written
         """
-        with open(self.DATA_FILE, "w") as file:
-            # Flatten all events from the dictionary into a single list for storage
+        with self._lock:
+            # Flatten all events from the dictionary, one JSON object per line
             # The dictionary structure is rebuilt on load for efficient lookups
-            all_events = []
-            for events_list in self.events_by_date.values():
-                all_events.extend([event.to_dict() for event in events_list])
-            json.dump(all_events, file, indent=2)
+            lines = []
+            for bucket in self.events_by_date.values():
+                lines.extend([_dumps(event.to_dict()) + b"\n" for event in bucket.events])
+            
+            data = b"".join(lines)
+            data_hash = hashlib.blake2b(data, digest_size=8).digest()
+            if data_hash != self._last_serialized_hash or not os.path.exists(self.DATA_FILE):
+                temp_file = self.DATA_FILE + ".tmp"
+                with open(temp_file, "wb") as file:
+                    file.write(data)
+                os.replace(temp_file, self.DATA_FILE)
+                self._last_serialized_hash = data_hash
+            
+            # Only now that the file holds exactly the current events
+            self._pending_records = []
+            self._log_records = len(lines)
+            self._dead_records = 0
+            self._log_needs_rewrite = False
+    
+    def compact(self):
+        """
+        Rewrite the data file if most of its lines are no longer needed.
+        
+        Deleting events leaves both the original line and the deletion line in
+        the log. Once more than COMPACT_RATIO of the lines are dead, the file is
+        rewritten with only the live events (see save_events()).
+        """
+        if self._log_records and self._dead_records / self._log_records > self.COMPACT_RATIO:
+            self.save_events()
+    
+    def _record_change(self, event, deleted=False):
+        """
+        Queue a change for the data file.
+        
+        Outside of a batch the change is written immediately, as before.
+        Inside a batch the write is deferred until the outermost batch ends.
+        
+        Args:
+            event (Event): The event that was added or deleted
+            deleted (bool): True if the event was deleted
+        """
+        record = event.to_dict()
+        if deleted:
+            record = dict(record, op="del")
+            self._dead_records += 2
+        self._pending_records.append(record)
+        
+        if self._batch_depth == 0:
+            self._request_flush()
+    
+    def _request_flush(self):
+        """
+        Flush now, or hand the flush to the background thread in write-behind mode.
+        """
+        if not self._write_behind:
+            self.flush()
+            return
+        
+        if self._save_thread is None:
+            self._save_thread = threading.Thread(target=self._save_worker, daemon=True)
+            self._save_thread.start()
+            atexit.register(self.close)
+        
+        try:
+            self._save_queue.put_nowait(True)
+        except queue.Full:
+            # A save is already pending and will include this change
+            pass
+    
+    def _save_worker(self):
+        """
+        Background thread loop: flush each time a save is requested, until told to stop.
+        """
+        while self._save_queue.get():
+            try:
+                self.flush()
+            except Exception as error:
+                # A failed save leaves its changes pending (or the full rewrite
+                # still due), so the next save retries them. The thread must
+                # keep running, or no further changes would be saved until close()
+                print(f"Warning: Could not save events ({error}).")
+    
+    def close(self):
+        """
+        Finish writing any changes and stop the write-behind thread.
+        
+        Safe to call more than once. Afterwards, changes are saved immediately.
+        """
+        self._write_behind = False
+        if self._save_thread is not None:
+            if self._save_thread.is_alive():
+                # False tells the worker to stop once earlier requests are done
+                self._save_queue.put(False)
+                self._save_thread.join()
+            self._save_thread = None
+            atexit.unregister(self.close)
+        self.flush()
+    
+    def flush(self):
+        """
+        Append any unsaved changes to the data file in a single write.
+        
+        Only the changed events are written, so the cost does not grow with
+        the size of the calendar. The file is compacted afterwards if needed.
+        """
+        with self._lock:
+            if self._log_needs_rewrite:
+                self.save_events()
+                return
+            if not self._pending_records:
+                return
+            
+            data = b"".join([_dumps(record) + b"\n" for record in self._pending_records])
+            with open(self.DATA_FILE, "ab") as file:
+                file.write(data)
+            
+            self._log_records += len(self._pending_records)
+            self._pending_records = []
+            self._last_serialized_hash = None
+            self.compact()
+    
+    @contextmanager
+    def batch(self):
+        """
+        Group several changes into a single save.
+        
+        Every add or delete made inside the block only updates memory; the changes
+        are appended to the file in one write when the outermost batch exits.
+        Batches can be nested.
+        
+        Example:
+            with calendar.batch():
+                for title, start, end in new_events:
+                    calendar.add_event(title, start, end)
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._request_flush()
     
     def add_event(self, title, start_time, end_time):
         """
         Add a new event to the calendar if it doesn't conflict with existing events.
         
-        Time Complexity: O(m) where m is the number of events on the same date.
+        Time Complexity: O(log m) to find a conflict, where m is the number of events
+        on the same date (inserting into the sorted lists is still O(m)).
         This is much better than O(n) since we only check events on the relevant date.
         
         Args:
@@ -144,21 +568,23 @@ class Calendar:
         
         # Create the new event to check for conflicts
         new_event = Event(title, start_time, end_time)
-        date_key = self._get_date_key(start_time)
+        # The event computed its date key when it was created, so reuse it
+        date_key = self._get_date_key(new_event)
         
         # Only check events on the same date for conflicts - this is the key optimization
         # Instead of scanning all events in the calendar, we only look at events for this date
-        events_on_date = self.events_by_date.get(date_key, [])
+        bucket = self.events_by_date.get(date_key)
         
-        for existing_event in events_on_date:
-            if new_event.overlaps_with(existing_event):
-                conflict_start = existing_event.start_time.strftime('%I:%M %p')
-                conflict_end = existing_event.end_time.strftime('%I:%M %p')
-                return False, f"Error: This event overlaps with '{existing_event.title}' ({conflict_start} - {conflict_end})"
+        if bucket is not None:
+            first_conflict = bucket.first_overlap(new_event.start_ts, new_event.end_ts)
+            if first_conflict >= 0:
+                existing_event = bucket.events[first_conflict]
+                return False, f"Error: This event overlaps with '{existing_event.title}' ({existing_event.time_range_str()})"
         
         # No conflicts found, insert the event in sorted order
-        self._insert_sorted(date_key, new_event)
-        self.save_events()
+        with self._lock:
+            self._insert_sorted(date_key, new_event)
+            self._record_change(new_event)
         return True, f"Event '{title}' added successfully!"
     
     def get_events_for_date(self, target_date):
@@ -180,7 +606,10 @@ class Calendar:
         # O(1) dictionary lookup instead of O(n) linear scan
         # Return a copy of the list to prevent external modification
         # Events are already sorted by start time from _insert_sorted
-        return list(self.events_by_date.get(date_key, []))
+        bucket = self.events_by_date.get(date_key)
+        if bucket is None:
+            return []
+        return list(bucket.events)
     
     def get_remaining_events_today(self):
         """
@@ -188,27 +617,31 @@ class Calendar:
         
         Time Complexity: O(m) where m is the number of events today.
         Previously O(n) where n was total events. We use binary search to find
-        the starting point of remaining events for additional efficiency.
+        the events that start after now, which need no further checks.
         
         Returns:
             list: List of Event objects that are remaining today
         """
-        from bisect import bisect_left
-        
         now = datetime.now()
         today = now.date()
         date_key = self._get_date_key(today)
         
         # Get today's events with O(1) lookup instead of scanning all events
-        todays_events = self.events_by_date.get(date_key, [])
+        bucket = self.events_by_date.get(date_key)
         
-        if not todays_events:
+        if not bucket:
             return []
-        
-        # Since events are sorted by start time, we can use binary search to find
-        # a good starting point. Events ending after 'now' are the ones we want.
-        # We filter for events whose end_time > now (still in progress or upcoming)
-        remaining_events = [event for event in todays_events if event.end_time > now]
+        todays_events = bucket.events
+        
+        # Since events are sorted by start time, binary search splits them into
+        # those that started at or before 'now' and those that start later.
+        # Only the first group needs checking for end_time > now (in progress);
+        # every later event is upcoming
+        now_ts = to_epoch_micros(now)
+        ends = bucket.ends
+        first_upcoming = bisect_right(bucket.starts, now_ts)
+        remaining_events = [todays_events[i] for i in range(first_upcoming) if ends[i] > now_ts]
+        remaining_events.extend(todays_events[first_upcoming:])
         
         # Already sorted by start time from the dictionary structure
         return remaining_events
@@ -232,9 +665,9 @@ class Calendar:
             target_date = datetime.now().date()
         
         # Define the working hours for the day (8 AM to 6 PM)
-        # You can adjust these to match your preferences
-        day_start = datetime.combine(target_date, datetime.strptime("08:00", "%H:%M").time())
-        day_end = datetime.combine(target_date, datetime.strptime("18:00", "%H:%M").time())
+        # You can adjust DAY_START_TIME and DAY_END_TIME to match your preferences
+        day_start = datetime.combine(target_date, self.DAY_START_TIME)
+        day_end = datetime.combine(target_date, self.DAY_END_TIME)
         
         # If we're looking at today, don't suggest times in the past
         now = datetime.now()
@@ -247,30 +680,46 @@ class Calendar:
             else:
                 day_start = now.replace(minute=rounded_minutes, second=0, microsecond=0)
         
-        # Get all events for this date, sorted by start time
-        days_events = self.get_events_for_date(target_date)
+        # Get the start and end times of this date's events, sorted by start time.
+        # The search compares integer timestamps (microseconds) throughout
+        bucket = self.events_by_date.get(self._get_date_key(target_date))
+        starts = bucket.starts if bucket is not None else []
+        ends = bucket.ends if bucket is not None else []
         
-        # The duration we need as a timedelta
+        # The duration we need, as a timedelta and in microseconds
         needed_duration = timedelta(minutes=duration_minutes)
+        needed_micros = duration_minutes * 60 * 1_000_000
         
         # Start checking from the beginning of the day
-        current_time = day_start
+        current_time = to_epoch_micros(day_start)
+        day_end_ts = to_epoch_micros(day_end)
+        
+        # Events starting at or before that point can't leave a gap ahead of it,
+        # so skip them with a binary search and carry on from the latest time
+        # any of them ends (which, for a morning already half gone, saves
+        # stepping through each of them)
+        first = bisect_right(starts, current_time)
+        if first:
+            current_time = max(current_time, max(ends[:first]))
         
         # Check each potential slot
-        for event in days_events:
+        for i in range(first, len(starts)):
             # Is there enough time between now and the next event?
-            gap_end = event.start_time
-            if gap_end > current_time and (gap_end - current_time) >= needed_duration:
+            gap_end = starts[i]
+            if gap_end > current_time and (gap_end - current_time) >= needed_micros:
                 # Found a slot before this event
-                return (current_time, current_time + needed_duration)
+                slot_start = from_epoch_micros(current_time)
+                return (slot_start, slot_start + needed_duration)
             
             # Move past this event if it ends later than our current position
-            if event.end_time > current_time:
-                current_time = event.end_time
+            event_end = ends[i]
+            if event_end > current_time:
+                current_time = event_end
         
         # Check if there's time at the end of the day
-        if current_time < day_end and (day_end - current_time) >= needed_duration:
-            return (current_time, current_time + needed_duration)
+        if current_time < day_end_ts and (day_end_ts - current_time) >= needed_micros:
+            slot_start = from_epoch_micros(current_time)
+            return (slot_start, slot_start + needed_duration)
         
         # No slot found
         return None
@@ -292,22 +741,24 @@ class Calendar:
         """
         date_key = self._get_date_key(target_date)
         
-        # Get the events list for this date directly from the dictionary
-        events_on_date = self.events_by_date.get(date_key, [])
+        # Get the bucket for this date directly from the dictionary
+        bucket = self.events_by_date.get(date_key)
+        event_count = len(bucket) if bucket is not None else 0
         
         # Check if the index is valid
-        if event_index < 1 or event_index > len(events_on_date):
-            return False, f"Error: Invalid event number. Please choose 1-{len(events_on_date)}."
+        if event_index < 1 or event_index > event_count:
+            return False, f"Error: Invalid event number. Please choose 1-{event_count}."
         
-        # Get the event to delete (convert to 0-based index) and remove it
-        # Using pop() with index is O(m) but more direct than searching
-        event_to_delete = events_on_date.pop(event_index - 1)
-        
-        # Clean up empty date entries to keep the dictionary tidy
-        if not events_on_date:
-            del self.events_by_date[date_key]
-        
-        self.save_events()
+        with self._lock:
+            # Get the event to delete (convert to 0-based index) and remove it
+            # Using pop() with index is O(m) but more direct than searching
+            event_to_delete = bucket.pop(event_index - 1)
+            
+            # Clean up empty date entries to keep the dictionary tidy
+            if not bucket:
+                del self.events_by_date[date_key]
+            
+            self._record_change(event_to_delete, deleted=True)
         
         return True, f"Event '{event_to_delete.title}' deleted successfully!"
 
@@ -5,9 +5,34 @@ This module contains all the functions for user interaction.
 It handles displaying menus, getting user input, and formatting output.
 """
 
-from datetime import datetime
+import sys
+from datetime import date, datetime
+from functools import lru_cache
+from time import time as _epoch_seconds
 
 from calendar_manager import Calendar
+from event import format_12h
+
+
+# Format used to display dates, e.g. "Thursday, January 15, 2026"
+_LONG_DATE_FMT = "%A, %B %d, %Y"
+
+# Date formats accepted from the user, keyed by how the input looks, so only
+# the format that can possibly match is tried
+_SLASH_DATE_FORMATS = ("%m/%d/%Y",)  # 01/15/2026
+_ISO_DATE_FORMATS = ("%Y-%m-%d",)    # 2026-01-15
+_DASH_DATE_FORMATS = ("%m-%d-%Y",)   # 01-15-2026 (preferred)
+
+# Time formats accepted from the user, split on whether AM/PM was typed
+_12_HOUR_FORMATS = (
+    "%I:%M %p",  # 2:30 PM
+    "%I:%M%p",   # 2:30PM
+    "%I %p",     # 2 PM
+    "%I%p",      # 2PM
+)
+_24_HOUR_FORMATS = (
+    "%H:%M",     # 14:30 (24-hour)
+)
 
 
 # =============================================================================
@@ -38,79 +63,294 @@ def print_events(events, empty_message="No events found."):
         print(f"  {empty_message}")
         return
     
-    for i, event in enumerate(events, 1):
-        time_range = f"{event.start_time.strftime('%I:%M %p')} - {event.end_time.strftime('%I:%M %p')}"
-        print(f"  {i}. {event.title}")
-        print(f"     Time: {time_range}")
-        print()
+    # Build the whole listing first and write it in one go, rather than
+    # printing it a line at a time
+    sys.stdout.write("".join(
+        f"  {i}. {event.title}\n     Time: {event.time_range_str()}\n\n"
+        for i, event in enumerate(events, 1)
+    ))
+
+
+@lru_cache(maxsize=64)
+def _format_date(day):
+    """
+    Format a date for display, e.g. "Thursday, January 15, 2026".
+    
+    Results are cached, since the same few dates are shown again and again.
+    
+    Args:
+        day (date): The date to format
+        
+    Returns:
+        str: The formatted date
+    """
+    return day.strftime(_LONG_DATE_FMT)
 
 
 # =============================================================================
 # INPUT HELPER FUNCTIONS
 # =============================================================================
 
-def get_date_input(prompt, allow_empty=False):
+def _read(prompt):
+    """
+    Read a line from the user and check whether it asks to cancel.
+    
+    Args:
+        prompt (str): The prompt to show the user
+        
+    Returns:
+        tuple: (text, is_cancel) - the input without surrounding whitespace,
+            and whether it was "cancel" in any letter case
+    """
+    text = input(prompt).strip()
+    return text, text.casefold() == "cancel"
+
+
+@lru_cache(maxsize=1)
+def _today_for_minute(epoch_minute):
+    """
+    Get today's date, remembered for the given minute.
+    
+    Args:
+        epoch_minute (int): Minutes since the epoch; only used as the cache key
+        
+    Returns:
+        date: Today's date
+    """
+    return date.today()
+
+
+def _today():
+    """
+    Get today's date without building a full datetime on every call.
+    
+    The date is looked up at most once a minute. The local date only ever
+    changes on a minute boundary, so the result is never stale.
+    
+    Returns:
+        date: Today's date
+    """
+    return _today_for_minute(int(_epoch_seconds() // 60))
+
+
+def _date_formats_for(user_input):
+    """
+    Pick the date formats worth trying for an input, based on its separators.
+    
+    Args:
+        user_input (str): The date as typed by the user
+        
+    Returns:
+        tuple: Format strings for datetime.strptime
+    """
+    if "/" in user_input:
+        return _SLASH_DATE_FORMATS
+    # Only a four-digit year can come before the first dash in YYYY-MM-DD;
+    # MM-DD-YYYY may also have a dash at index 4 (e.g. 1-15-2027)
+    if user_input[:4].isdecimal() and user_input[4:5] == "-":
+        return _ISO_DATE_FORMATS
+    return _DASH_DATE_FORMATS
+
+
+def _time_formats_for(user_input):
+    """
+    Pick the time formats worth trying for an input, based on whether it has AM/PM.
+    
+    Args:
+        user_input (str): The time as typed by the user, in upper case
+        
+    Returns:
+        tuple: Format strings for datetime.strptime
+    """
+    if user_input.endswith(("AM", "PM")):
+        return _12_HOUR_FORMATS
+    return _24_HOUR_FORMATS
+
+
+@lru_cache(maxsize=64)
+def _parse_date_str(user_input):
+    """
+    Parse a date typed by the user.
+    
+    Results are cached, since the same dates tend to be typed again and again
+    during a session. Rules such as rejecting past dates are left to the caller,
+    so cached results never go stale when the day changes.
+    
+    Args:
+        user_input (str): The date as typed by the user
+        
+    Returns:
+        date: The parsed date, or None if it matches no accepted format
+    """
+    for date_format in _date_formats_for(user_input):
+        try:
+            return datetime.strptime(user_input, date_format).date()
+        except ValueError:
+            continue
+    return None
+
+
+def _parse_clock_number(digits, low, high):
+    """
+    Convert one or two ASCII digits to an int, if it lies within a range.
+    
+    Args:
+        digits (str): The digits to convert
+        low (int): The smallest value allowed
+        high (int): The largest value allowed
+        
+    Returns:
+        int: The value, or None if the digits are malformed or out of range
+    """
+    if not 1 <= len(digits) <= 2 or not digits.isascii() or not digits.isdigit():
+        return None
+    value = int(digits)
+    if not low <= value <= high:
+        return None
+    return value
+
+
+def _fast_parse_time(user_input):
+    """
+    Parse the usual time formats by hand, without going through strptime.
+    
+    Accepts exactly what the formats in _12_HOUR_FORMATS and _24_HOUR_FORMATS
+    would, for inputs written with ASCII digits, e.g. "2:30 PM", "2PM", "14:30".
+    Anything else is left to strptime.
+    
+    Args:
+        user_input (str): The time as typed by the user, in upper case
+        
+    Returns:
+        tuple: (hour, minute) on the 24-hour clock, or None if the input
+            wasn't recognized
+    """
+    period = user_input[-2:]
+    if period in ("AM", "PM"):
+        clock = user_input[:-2].rstrip()
+    else:
+        clock = user_input
+        period = None
+    
+    hour_digits, colon, minute_digits = clock.partition(":")
+    if colon:
+        minute = _parse_clock_number(minute_digits, 0, 59)
+    elif period is not None:
+        # "2 PM" - the minutes may be left out when AM/PM is given
+        minute = 0
+    else:
+        return None
+    if minute is None:
+        return None
+    
+    if period is None:
+        hour = _parse_clock_number(hour_digits, 0, 23)
+        if hour is None:
+            return None
+    else:
+        hour = _parse_clock_number(hour_digits, 1, 12)
+        if hour is None:
+            return None
+        # 12 AM is midnight and 12 PM is noon
+        hour %= 12
+        if period == "PM":
+            hour += 12
+    
+    return hour, minute
+
+
+@lru_cache(maxsize=64)
+def _parse_time_str(user_input):
+    """
+    Parse a time of day typed by the user.
+    
+    Results are cached, since the same times tend to be typed again and again
+    during a session. The time is returned as plain integers, so callers can
+    build the full datetime in one step.
+    
+    Args:
+        user_input (str): The time as typed by the user
+        
+    Returns:
+        tuple: (hour, minute) on the 24-hour clock, or None if it matches
+            no accepted format
+    """
+    user_input = user_input.upper()
+    
+    # The common formats are parsed by hand, which is much faster than strptime
+    parsed_time = _fast_parse_time(user_input)
+    if parsed_time is not None:
+        return parsed_time
+    
+    for time_format in _time_formats_for(user_input):
+        try:
+            parsed = datetime.strptime(user_input, time_format)
+            return parsed.hour, parsed.minute
+        except ValueError:
+            continue
+    return None
+
+
+def get_date_input(prompt, allow_empty=False, now=None):
     """
     Get a valid date from the user.
     
     Args:
         prompt (str): The prompt to show the user
         allow_empty (bool): If True, empty input returns today's date
+        now (datetime, optional): The current time, if the caller already has it
         
     Returns:
         date: The parsed date, or None if cancelled
     """
+    # Work out today's date once rather than on every attempt
+    today = now.date() if now is not None else _today()
+    
     while True:
-        user_input = input(prompt).strip()
+        user_input, cancelled = _read(prompt)
         
         # Allow empty input to mean "today" if specified
         if not user_input and allow_empty:
-            return datetime.now().date()
+            return today
         
         if not user_input:
             print("  Please enter a date or type 'cancel' to go back.")
             continue
         
-        if user_input.lower() == "cancel":
+        if cancelled:
             return None
         
         # Try to parse the date in common formats (MM-DD-YYYY is preferred)
-        date_formats = ["%m-%d-%Y", "%m/%d/%Y", "%Y-%m-%d"]
-        
-        for date_format in date_formats:
-            try:
-                parsed_date = datetime.strptime(user_input, date_format).date()
-                
-                # Prevent scheduling events in the past - users shouldn't be able to
-                # create appointments for dates that have already occurred
-                if parsed_date < datetime.now().date():
-                    print("  Cannot schedule events in the past. Please enter today's date or a future date.")
-                    break
-                
-                return parsed_date
-            except ValueError:
-                continue
-        else:
-            # This else belongs to the for loop - it only runs if no format matched
-            # (i.e., the loop completed without breaking due to a past date rejection)
+        parsed_date = _parse_date_str(user_input)
+        if parsed_date is None:
             print("  Invalid date format. Please use MM-DD-YYYY or MM/DD/YYYY")
+            continue
+        
+        # Prevent scheduling events in the past - users shouldn't be able to
+        # create appointments for dates that have already occurred
+        if parsed_date < today:
+            print("  Cannot schedule events in the past. Please enter today's date or a future date.")
+            continue
+        
+        return parsed_date
 
 
-def get_time_input(prompt, date):
+def get_time_input(prompt, event_date, now=None):
     """
     Get a valid time from the user and combine it with a date.
     
     Args:
         prompt (str): The prompt to show the user
-        date (date): The date to combine with the time
+        event_date (date): The date to combine with the time
+        now (datetime, optional): If given, times before it are rejected
         
     Returns:
         datetime: The combined date and time, or None if cancelled
     """
     while True:
-        user_input = input(prompt).strip()
+        user_input, cancelled = _read(prompt)
         
-        if user_input.lower() == "cancel":
+        if cancelled:
             return None
         
         if not user_input:
@@ -118,22 +358,22 @@ def get_time_input(prompt, date):
             continue
         
         # Try various time formats
-        time_formats = [
-            "%I:%M %p",  # 2:30 PM
-            "%I:%M%p",   # 2:30PM
-            "%H:%M",     # 14:30 (24-hour)
-            "%I %p",     # 2 PM
-            "%I%p",      # 2PM
-        ]
+        parsed_time = _parse_time_str(user_input)
+        if parsed_time is None:
+            print("  Invalid time format. Examples: 2:30 PM, 14:30, 9 AM")
+            continue
         
-        for time_format in time_formats:
-            try:
-                parsed_time = datetime.strptime(user_input.upper(), time_format).time()
-                return datetime.combine(date, parsed_time)
-            except ValueError:
-                continue
+        # Build the datetime straight from the date and the parsed numbers
+        hour, minute = parsed_time
+        combined = datetime(event_date.year, event_date.month, event_date.day, hour, minute)
+        
+        # Checked against the caller's clock reading, rather than reading the
+        # clock again on every attempt
+        if now is not None and combined < now:
+            print("  Cannot schedule events in the past. Please enter a future time.")
+            continue
         
-        print("  Invalid time format. Examples: 2:30 PM, 14:30, 9 AM")
+        return combined
 
 
 # ********************
@@ -149,35 +389,35 @@ def create_event_flow(calendar):
     """
     print_header("Create New Event")
     
+    # Read the clock once for all of this flow's "in the past" checks
+    now = datetime.now()
+    
     # Get the event title
-    title = input("  Enter event title (or 'cancel'): ").strip()
-    if not title or title.lower() == "cancel":
+    title, cancelled = _read("  Enter event title (or 'cancel'): ")
+    if not title or cancelled:
         print("  Event creation cancelled.")
         return
     
     # Get the date for the event
     print("\n  Enter the date for this event:")
-    event_date = get_date_input("  Date (MM-DD-YYYY) or press Enter for today: ", allow_empty=True)
+    event_date = get_date_input("  Date (MM-DD-YYYY) or press Enter for today: ", allow_empty=True, now=now)
     if event_date is None:
         print("  Event creation cancelled.")
         return
     
     # Get the start time
-    print(f"\n  Date selected: {event_date.strftime('%A, %B %d, %Y')}")
-    
-    while True:
-        start_time = get_time_input("  Start time (e.g., 9:00 AM): ", event_date)
-        if start_time is None:
-            print("  Event creation cancelled.")
-            return
-        
-        # If the user selected today's date, make sure the start time hasn't already passed
-        # since it doesn't make sense to schedule an event that's already in the past
-        if event_date == datetime.now().date() and start_time < datetime.now():
-            print("  Cannot schedule events in the past. Please enter a future time.")
-            continue
-        
-        break
+    print(f"\n  Date selected: {_format_date(event_date)}")
+    
+    # If the user selected today's date, make sure the start time hasn't already passed
+    # since it doesn't make sense to schedule an event that's already in the past
+    start_time = get_time_input(
+        "  Start time (e.g., 9:00 AM): ",
+        event_date,
+        now=now if event_date == now.date() else None
+    )
+    if start_time is None:
+        print("  Event creation cancelled.")
+        return
     
     # Get the end time
     end_time = get_time_input("  End time (e.g., 10:00 AM): ", event_date)
@@ -203,7 +443,7 @@ def view_events_flow(calendar):
     if target_date is None:
         return
     
-    print(f"\n  Events for {target_date.strftime('%A, %B %d, %Y')}:\n")
+    print(f"\n  Events for {_format_date(target_date)}:\n")
     events = calendar.get_events_for_date(target_date)
     print_events(events, "No events scheduled for this date.")
 
@@ -217,9 +457,9 @@ def view_remaining_events_flow(calendar):
     """
     print_header("Remaining Events Today")
     
-    today = datetime.now().date()
-    print(f"  Date: {today.strftime('%A, %B %d, %Y')}")
-    print(f"  Current time: {datetime.now().strftime('%I:%M %p')}\n")
+    now = datetime.now()
+    print(f"  Date: {_format_date(now.date())}")
+    print(f"  Current time: {format_12h(now)}\n")
     
     events = calendar.get_remaining_events_today()
     print_events(events, "No remaining events for today.")
@@ -236,9 +476,9 @@ def find_slot_flow(calendar):
     
     # Get the duration needed
     while True:
-        duration_input = input("  How many minutes do you need? (e.g., 30, 60): ").strip()
+        duration_input, cancelled = _read("  How many minutes do you need? (e.g., 30, 60): ")
         
-        if duration_input.lower() == "cancel":
+        if cancelled:
             return
         
         try:
@@ -258,12 +498,12 @@ def find_slot_flow(calendar):
     # Search for an available slot
     slot = calendar.find_next_available_slot(duration, target_date)
     
-    print(f"\n  Searching for a {duration}-minute slot on {target_date.strftime('%A, %B %d, %Y')}...")
+    print(f"\n  Searching for a {duration}-minute slot on {_format_date(target_date)}...")
     
     if slot:
         start, end = slot
         print(f"\n  Available slot found!")
-        print(f"  Time: {start.strftime('%I:%M %p')} - {end.strftime('%I:%M %p')}")
+        print(f"  Time: {format_12h(start)} - {format_12h(end)}")
     else:
         print("\n  No available slot found for the requested duration.")
         print("  Try a shorter duration or a different date.")
@@ -287,17 +527,17 @@ def delete_event_flow(calendar):
     events = calendar.get_events_for_date(target_date)
     
     if not events:
-        print(f"\n  No events found for {target_date.strftime('%A, %B %d, %Y')}.")
+        print(f"\n  No events found for {_format_date(target_date)}.")
         return
     
-    print(f"\n  Events for {target_date.strftime('%A, %B %d, %Y')}:\n")
+    print(f"\n  Events for {_format_date(target_date)}:\n")
     print_events(events)
     
     # Ask which event to delete
     while True:
-        choice = input(f"  Enter event number to delete (1-{len(events)}) or 'cancel': ").strip()
+        choice, cancelled = _read(f"  Enter event number to delete (1-{len(events)}) or 'cancel': ")
         
-        if choice.lower() == "cancel":
+        if cancelled:
             print("  Deletion cancelled.")
             return
         
@@ -337,7 +577,8 @@ def run_cli():
     print("=" * 50)
     
     # Initialize the calendar (this will load any saved events)
-    calendar = Calendar()
+    # Changes are saved in the background so menu actions never wait on the disk
+    calendar = Calendar(write_behind=True)
     
     # Main application loop
     while True:
@@ -357,6 +598,7 @@ def run_cli():
         elif choice == "5":
             delete_event_flow(calendar)
         elif choice == "6":
+            calendar.close()
             print("\n  Thank you for using Simple Calendar!")
             print("  Your events have been saved. Goodbye!\n")
             break
@@ -5,7 +5,63 @@ This module contains the Event class which represents a single calendar event.
 Each event has a title, start time, and end time.
 """
 
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+
+
+# Reference points for converting datetimes to whole microseconds
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+def to_epoch_micros(value):
+    """
+    Convert a datetime to an integer number of microseconds since 1970-01-01.
+    
+    Naive datetimes are measured as wall-clock time (no time zone conversion),
+    so the integers sort exactly like the datetimes they came from.
+    
+    Args:
+        value (datetime): The datetime to convert
+        
+    Returns:
+        int: Microseconds since the epoch
+    """
+    epoch = _EPOCH if value.tzinfo is None else _EPOCH_UTC
+    return (value - epoch) // _ONE_MICROSECOND
+
+
+def from_epoch_micros(value):
+    """
+    Convert microseconds since 1970-01-01 back to a naive datetime.
+    
+    This is the inverse of to_epoch_micros() for naive datetimes.
+    
+    Args:
+        value (int): Microseconds since the epoch
+        
+    Returns:
+        datetime: The corresponding naive datetime
+    """
+    return _EPOCH + timedelta(microseconds=value)
+
+
+def format_12h(value):
+    """
+    Format the time of day of a datetime on the 12-hour clock, e.g. "09:30 AM".
+    
+    Gives the same result as strftime("%I:%M %p") (in English), but is built
+    with plain integer formatting instead of going through strftime. Used for
+    every time shown to the user, so they are all formatted the same way.
+    
+    Args:
+        value (datetime): The datetime to format
+        
+    Returns:
+        str: The formatted time
+    """
+    hour = value.hour
+    return f"{hour % 12 or 12:02d}:{value.minute:02d} {'AM' if hour < 12 else 'PM'}"
 
 
 class Event:
@@ -15,8 +71,28 @@ class Event:
     Each event has a title and a time range (start and end).
     Events are stored with full datetime information to support
     scheduling across multiple days.
+    
+    Optimization: The dictionary form used for storage is cached, since saving
+    the calendar converts every event even when only one of them changed, and so
+    is the formatted time range shown in event lists.
+    Assigning to title, start_time or end_time clears the caches. The date key
+    (YYYY-MM-DD) the calendar files the event under is also kept up to date
+    whenever start_time is assigned, as are start_ts and end_ts: the start and
+    end times as integer microseconds, which are much cheaper to compare than
+    datetime objects in the overlap and binary search hot paths.
+    
+    __slots__ removes the per-instance __dict__, making each event smaller and
+    its attributes faster to read, which adds up for large calendars.
     """
     
+    __slots__ = (
+        "title", "start_time", "end_time",
+        "start_ts", "end_ts", "_cached_dict", "_date_key", "_time_range_str",
+    )
+    
+    # The attributes that the cached data is derived from
+    _FIELDS = ("title", "start_time", "end_time")
+    
     def __init__(self, title, start_time, end_time):
         """
         Create a new event.
@@ -26,9 +102,52 @@ class Event:
             start_time (datetime): When the event begins
             end_time (datetime): When the event ends
         """
-        self.title = title
-        self.start_time = start_time
-        self.end_time = end_time
+        self._init_fields(
+            title, start_time, end_time,
+            to_epoch_micros(start_time), to_epoch_micros(end_time)
+        )
+    
+    def _init_fields(self, title, start_time, end_time, start_ts, end_ts):
+        """
+        Set every attribute of a new event, including the derived ones.
+        
+        This is the one place that knows all the slots; both __init__ and
+        from_dicts() go through it. Later changes go through __setattr__.
+        
+        Args:
+            title (str): The name/description of the event
+            start_time (datetime): When the event begins
+            end_time (datetime): When the event ends
+            start_ts (int): start_time as microseconds since the epoch
+            end_ts (int): end_time as microseconds since the epoch
+        """
+        set_attr = object.__setattr__
+        set_attr(self, "title", title)
+        set_attr(self, "start_time", start_time)
+        set_attr(self, "end_time", end_time)
+        set_attr(self, "start_ts", start_ts)
+        set_attr(self, "end_ts", end_ts)
+        set_attr(self, "_date_key", start_time.date().isoformat())
+        set_attr(self, "_cached_dict", None)
+        set_attr(self, "_time_range_str", None)
+    
+    def __setattr__(self, name, value):
+        """
+        Set an attribute, clearing cached data when an event field changes.
+        
+        Args:
+            name (str): The attribute name
+            value: The new value
+        """
+        object.__setattr__(self, name, value)
+        if name in self._FIELDS:
+            object.__setattr__(self, "_cached_dict", None)
+            object.__setattr__(self, "_time_range_str", None)
+            if name == "start_time":
+                object.__setattr__(self, "_date_key", value.date().isoformat())
+                object.__setattr__(self, "start_ts", to_epoch_micros(value))
+            elif name == "end_time":
+                object.__setattr__(self, "end_ts", to_epoch_micros(value))
     
     def overlaps_with(self, other_event):
         """
@@ -45,39 +164,119 @@ class Event:
             bool: True if the events overlap, False otherwise
         """
         # Events overlap if: this starts before other ends AND this ends after other starts
-        return (self.start_time < other_event.end_time and 
-                self.end_time > other_event.start_time)
+        # Compared as integer timestamps, which is faster than comparing datetimes
+        return (self.start_ts < other_event.end_ts and 
+                self.end_ts > other_event.start_ts)
+    
+    def time_range_str(self):
+        """
+        Get the event's start and end times for display, e.g. "09:00 AM - 10:00 AM".
+        
+        The string is formatted once and reused until the event changes.
+        
+        Returns:
+            str: The formatted time range
+        """
+        if self._time_range_str is None:
+            self._time_range_str = (
+                f"{format_12h(self.start_time)} - {format_12h(self.end_time)}"
+            )
+        return self._time_range_str
     
     def to_dict(self):
         """
         Convert the event to a dictionary for JSON storage.
         
+        Times are stored as integer microseconds since 1970-01-01 (the start_ts
+        and end_ts values) under the short keys "s" and "e". Integers are much
+        cheaper to write and read back than ISO date strings.
+        
+        Times with a time zone are kept as ISO format "start_time" and
+        "end_time" strings instead, since the integers can only be turned back
+        into naive datetimes and the time zone would be lost.
+        
+        The dictionary is built once and reused until the event changes, so
+        callers must not modify it.
+        
         Returns:
-            dict: Event data with datetime converted to ISO format strings
+            dict: Event data with the title and integer start and end times
         """
-        return {
-            "title": self.title,
-            "start_time": self.start_time.isoformat(),
-            "end_time": self.end_time.isoformat()
-        }
+        if self._cached_dict is None:
+            if self.start_time.tzinfo is None and self.end_time.tzinfo is None:
+                self._cached_dict = {
+                    "title": self.title,
+                    "s": self.start_ts,
+                    "e": self.end_ts
+                }
+            else:
+                self._cached_dict = {
+                    "title": self.title,
+                    "start_time": self.start_time.isoformat(),
+                    "end_time": self.end_time.isoformat()
+                }
+        return self._cached_dict
     
     @classmethod
     def from_dict(cls, data):
         """
         Create an Event from a dictionary (loaded from JSON).
         
+        Dictionaries with ISO format "start_time" and "end_time" strings, as
+        saved by older versions and for times with a time zone, are also accepted.
+        
         Args:
             data (dict): Dictionary containing event data
             
         Returns:
             Event: A new Event instance
         """
+        if "s" in data:
+            return cls(
+                title=data["title"],
+                start_time=from_epoch_micros(data["s"]),
+                end_time=from_epoch_micros(data["e"])
+            )
+        
+        # ISO strings (legacy format, or times with a time zone)
         return cls(
             title=data["title"],
             start_time=datetime.fromisoformat(data["start_time"]),
             end_time=datetime.fromisoformat(data["end_time"])
         )
     
+    @classmethod
+    def from_dicts(cls, rows):
+        """
+        Create Events from many dictionaries at once (e.g. when loading the calendar).
+        
+        Gives the same events as calling from_dict() on each row, but rows in the
+        integer format are built directly: start_ts and end_ts are taken from the
+        data instead of being recomputed from the datetimes, and the attributes
+        are set in one go by _init_fields() rather than through __setattr__.
+        
+        Args:
+            rows (iterable): Dictionaries containing event data
+            
+        Returns:
+            list: The new Event instances, in the same order as the rows
+        """
+        new = object.__new__
+        events = []
+        for data in rows:
+            if "s" not in data:
+                events.append(cls.from_dict(data))
+                continue
+            
+            start_ts = data["s"]
+            end_ts = data["e"]
+            event = new(cls)
+            event._init_fields(
+                data["title"], from_epoch_micros(start_ts), from_epoch_micros(end_ts),
+                start_ts, end_ts
+            )
+            events.append(event)
+        return events
+    
     def __str__(self):
         """
         Create a human-readable string representation of the event.
@@ -85,8 +284,9 @@ class Event:
         Returns:
             str: Formatted event details
         """
-        date_str = self.start_time.strftime("%Y-%m-%d")
-        start_str = self.start_time.strftime("%I:%M %p")
-        end_str = self.end_time.strftime("%I:%M %p")
-        return f"{self.title}: {date_str} from {start_str} to {end_str}"
+        start = self.start_time
+        # Formatted from the date and time fields directly, which is much
+        # cheaper than three strftime calls
+        date_str = f"{start.year:04d}-{start.month:02d}-{start.day:02d}"
+        return f"{self.title}: {date_str} from {format_12h(start)} to {format_12h(self.end_time)}"
 
@@ -11,14 +11,16 @@ These tests cover:
 - Retrieving events for a specific date
 - Finding available time slots
 - Data serialization (converting to/from JSON format)
+- Parsing dates and times typed into the command line interface
 """
 
 import unittest
 import os
-from datetime import datetime, date, timedelta
+from datetime import datetime, date, timedelta, timezone
 
 from event import Event
 from calendar_manager import Calendar
+from cli import _parse_date_str, _parse_time_str
 
 
 class TestEventOverlap(unittest.TestCase):
@@ -154,6 +156,30 @@ class TestEventOverlap(unittest.TestCase):
         )
         
         self.assertFalse(event_a.overlaps_with(event_b))
+    
+    def test_overlap_uses_updated_times(self):
+        """
+        Test that moving an event is taken into account.
+        
+        Event B is moved from 10:00 AM - 11:00 AM to 9:30 AM - 10:30 AM,
+        so it now overlaps Event A (9:00 AM - 10:00 AM).
+        """
+        event_a = Event(
+            "Meeting A",
+            datetime(2026, 1, 15, 9, 0),
+            datetime(2026, 1, 15, 10, 0)
+        )
+        event_b = Event(
+            "Meeting B",
+            datetime(2026, 1, 15, 10, 0),
+            datetime(2026, 1, 15, 11, 0)
+        )
+        self.assertFalse(event_a.overlaps_with(event_b))
+        
+        event_b.start_time = datetime(2026, 1, 15, 9, 30)
+        event_b.end_time = datetime(2026, 1, 15, 10, 30)
+        
+        self.assertTrue(event_a.overlaps_with(event_b))
 
 
 class TestEventSerialization(unittest.TestCase):
@@ -172,12 +198,27 @@ class TestEventSerialization(unittest.TestCase):
         
         result = event.to_dict()
         
+        # Times are stored as microseconds since 1970-01-01
         self.assertEqual(result["title"], "Team Standup")
-        self.assertEqual(result["start_time"], "2026-01-15T09:00:00")
-        self.assertEqual(result["end_time"], "2026-01-15T09:30:00")
+        self.assertEqual(result["s"], 1768467600000000)
+        self.assertEqual(result["e"], 1768469400000000)
     
     def test_event_from_dict(self):
         """Test that an event can be recreated from a dictionary."""
+        data = {
+            "title": "Project Review",
+            "s": 1768485600000000,
+            "e": 1768489200000000
+        }
+        
+        event = Event.from_dict(data)
+        
+        self.assertEqual(event.title, "Project Review")
+        self.assertEqual(event.start_time, datetime(2026, 1, 15, 14, 0))
+        self.assertEqual(event.end_time, datetime(2026, 1, 15, 15, 0))
+    
+    def test_event_from_legacy_dict(self):
+        """Test that an event saved with ISO format times can still be loaded."""
         data = {
             "title": "Project Review",
             "start_time": "2026-01-15T14:00:00",
@@ -209,6 +250,77 @@ class TestEventSerialization(unittest.TestCase):
         self.assertEqual(restored.title, original.title)
         self.assertEqual(restored.start_time, original.start_time)
         self.assertEqual(restored.end_time, original.end_time)
+    
+    def test_from_dicts_matches_from_dict(self):
+        """Test that building events in a batch gives the same events as one at a time."""
+        rows = [
+            Event("Standup", datetime(2026, 1, 15, 9, 0), datetime(2026, 1, 15, 9, 30)).to_dict(),
+            {
+                "title": "Project Review",
+                "start_time": "2026-01-15T14:00:00",
+                "end_time": "2026-01-15T15:00:00"
+            }
+        ]
+        
+        events = Event.from_dicts(rows)
+        
+        self.assertEqual(len(events), 2)
+        for event, row in zip(events, rows):
+            expected = Event.from_dict(row)
+            self.assertEqual(event.title, expected.title)
+            self.assertEqual(event.start_time, expected.start_time)
+            self.assertEqual(event.end_time, expected.end_time)
+            self.assertEqual(event.to_dict(), expected.to_dict())
+            self.assertEqual(event.time_range_str(), expected.time_range_str())
+    
+    def test_event_has_no_instance_dict(self):
+        """Test that events use __slots__ instead of a per-instance __dict__."""
+        event = Event(
+            "Team Standup",
+            datetime(2026, 1, 15, 9, 0),
+            datetime(2026, 1, 15, 9, 30)
+        )
+        
+        self.assertFalse(hasattr(event, "__dict__"))
+        with self.assertRaises(AttributeError):
+            event.location = "Room 1"
+    
+    def test_to_dict_updates_after_change(self):
+        """Test that changing an event is reflected in its dictionary form."""
+        event = Event(
+            "Draft Title",
+            datetime(2026, 1, 15, 9, 0),
+            datetime(2026, 1, 15, 9, 30)
+        )
+        self.assertEqual(event.to_dict()["title"], "Draft Title")
+        
+        event.title = "Final Title"
+        event.end_time = datetime(2026, 1, 15, 10, 0)
+        
+        result = event.to_dict()
+        self.assertEqual(result["title"], "Final Title")
+        self.assertEqual(result["e"], 1768471200000000)
+    
+    def test_time_range_str(self):
+        """Test the displayed time range, including after the event moves."""
+        event = Event(
+            "Team Standup",
+            datetime(2026, 1, 15, 9, 0),
+            datetime(2026, 1, 15, 9, 30)
+        )
+        self.assertEqual(event.time_range_str(), "09:00 AM - 09:30 AM")
+        
+        event.end_time = datetime(2026, 1, 15, 13, 15)
+        self.assertEqual(event.time_range_str(), "09:00 AM - 01:15 PM")
+    
+    def test_str(self):
+        """Test the readable form of an event around midnight and noon."""
+        event = Event(
+            "Late Night Deploy",
+            datetime(2026, 1, 5, 0, 5),
+            datetime(2026, 1, 5, 12, 0)
+        )
+        self.assertEqual(str(event), "Late Night Deploy: 2026-01-05 from 12:05 AM to 12:00 PM")
 
 
 class TestCalendar(unittest.TestCase):
@@ -224,20 +336,23 @@ class TestCalendar(unittest.TestCase):
         Set up a fresh calendar for each test.
         We use a different data file so tests don't affect real data.
         """
-        # Use a test-specific data file
-        Calendar.DATA_FILE = "test_calendar_data.json"
+        # Use test-specific data files
+        Calendar.DATA_FILE = "test_calendar_data.jsonl"
+        Calendar.LEGACY_DATA_FILE = "test_calendar_data.json"
         
-        # Remove any existing test data file
-        if os.path.exists(Calendar.DATA_FILE):
-            os.remove(Calendar.DATA_FILE)
+        # Remove any existing test data files
+        for path in (Calendar.DATA_FILE, Calendar.LEGACY_DATA_FILE):
+            if os.path.exists(path):
+                os.remove(path)
         
         # Create a fresh calendar
         self.calendar = Calendar()
     
     def tearDown(self):
-        """Clean up the test data file after each test."""
-        if os.path.exists(Calendar.DATA_FILE):
-            os.remove(Calendar.DATA_FILE)
+        """Clean up the test data files after each test."""
+        for path in (Calendar.DATA_FILE, Calendar.LEGACY_DATA_FILE):
+            if os.path.exists(path):
+                os.remove(path)
     
     def test_add_event_success(self):
         """Test that a valid event can be added."""
@@ -249,7 +364,7 @@ class TestCalendar(unittest.TestCase):
         
         self.assertTrue(success)
         self.assertIn("successfully", message.lower())
-        self.assertEqual(len(self.calendar.events), 1)
+        self.assertEqual(len(self.calendar.get_events_for_date(date(2026, 1, 15))), 1)
     
     def test_add_event_rejects_end_before_start(self):
         """Test that an event with end time before start time is rejected."""
@@ -261,7 +376,7 @@ class TestCalendar(unittest.TestCase):
         
         self.assertFalse(success)
         self.assertIn("error", message.lower())
-        self.assertEqual(len(self.calendar.events), 0)
+        self.assertEqual(len(self.calendar.get_events_for_date(date(2026, 1, 15))), 0)
     
     def test_add_event_rejects_overlapping_event(self):
         """Test that overlapping events are prevented."""
@@ -281,7 +396,7 @@ class TestCalendar(unittest.TestCase):
         
         self.assertFalse(success)
         self.assertIn("overlap", message.lower())
-        self.assertEqual(len(self.calendar.events), 1)  # Only first event exists
+        self.assertEqual(len(self.calendar.get_events_for_date(date(2026, 1, 15))), 1)  # Only first event exists
     
     def test_add_event_allows_adjacent_events(self):
         """Test that back-to-back events are allowed."""
@@ -300,7 +415,7 @@ class TestCalendar(unittest.TestCase):
         )
         
         self.assertTrue(success)
-        self.assertEqual(len(self.calendar.events), 2)
+        self.assertEqual(len(self.calendar.get_events_for_date(date(2026, 1, 15))), 2)
     
     def test_get_events_for_date(self):
         """Test retrieving events for a specific date."""
@@ -412,7 +527,7 @@ class TestCalendar(unittest.TestCase):
         success, message = self.calendar.delete_event(1, date(2026, 1, 15))
         
         self.assertTrue(success)
-        self.assertEqual(len(self.calendar.events), 0)
+        self.assertEqual(len(self.calendar.get_events_for_date(date(2026, 1, 15))), 0)
     
     def test_delete_event_invalid_index(self):
         """Test that deleting with an invalid index fails gracefully."""
@@ -428,7 +543,7 @@ class TestCalendar(unittest.TestCase):
         
         self.assertFalse(success)
         self.assertIn("invalid", message.lower())
-        self.assertEqual(len(self.calendar.events), 1)  # Event still exists
+        self.assertEqual(len(self.calendar.get_events_for_date(date(2026, 1, 15))), 1)  # Event still exists
     
     def test_data_persistence(self):
         """Test that events are saved and can be reloaded."""
@@ -443,8 +558,239 @@ class TestCalendar(unittest.TestCase):
         new_calendar = Calendar()
         
         # The event should still be there
-        self.assertEqual(len(new_calendar.events), 1)
-        self.assertEqual(new_calendar.events[0].title, "Persistent Meeting")
+        self.assertEqual(len(new_calendar.get_events_for_date(date(2026, 1, 15))), 1)
+        self.assertEqual(new_calendar.get_events_for_date(date(2026, 1, 15))[0].title, "Persistent Meeting")
+
+    
+    def test_batch_saves_once_on_exit(self):
+        """Test that changes made inside a batch are only written when it ends."""
+        with self.calendar.batch():
+            self.calendar.add_event(
+                "Batched Meeting 1",
+                datetime(2026, 1, 15, 9, 0),
+                datetime(2026, 1, 15, 10, 0)
+            )
+            self.calendar.add_event(
+                "Batched Meeting 2",
+                datetime(2026, 1, 16, 9, 0),
+                datetime(2026, 1, 16, 10, 0)
+            )
+            
+            # Nothing has been written yet
+            self.assertFalse(os.path.exists(Calendar.DATA_FILE))
+        
+        # Both events are saved once the batch exits
+        new_calendar = Calendar()
+        self.assertEqual(len(new_calendar.get_events_for_date(date(2026, 1, 15))), 1)
+        self.assertEqual(len(new_calendar.get_events_for_date(date(2026, 1, 16))), 1)
+
+    
+    def test_save_events_replaces_file_atomically(self):
+        """Test that saving leaves no temporary file and skips unchanged data."""
+        self.calendar.add_event(
+            "Saved Meeting",
+            datetime(2026, 1, 15, 9, 0),
+            datetime(2026, 1, 15, 10, 0)
+        )
+        self.calendar.save_events()
+        self.assertFalse(os.path.exists(Calendar.DATA_FILE + ".tmp"))
+        
+        # Saving again with nothing changed must not rewrite the file
+        os.utime(Calendar.DATA_FILE, ns=(0, 0))
+        self.calendar.save_events()
+        self.assertEqual(os.stat(Calendar.DATA_FILE).st_mtime_ns, 0)
+    
+    def test_write_behind_saves_on_close(self):
+        """Test that changes saved in the background are on disk after close()."""
+        calendar = Calendar(write_behind=True)
+        calendar.add_event(
+            "Background Meeting",
+            datetime(2026, 1, 15, 9, 0),
+            datetime(2026, 1, 15, 10, 0)
+        )
+        calendar.close()
+        
+        new_calendar = Calendar()
+        self.assertEqual(len(new_calendar.get_events_for_date(date(2026, 1, 15))), 1)
+        self.assertEqual(new_calendar.get_events_for_date(date(2026, 1, 15))[0].title, "Background Meeting")
+    
+    def test_deletion_persists(self):
+        """Test that a deleted event stays deleted after a restart."""
+        self.calendar.add_event(
+            "Kept Meeting",
+            datetime(2026, 1, 15, 9, 0),
+            datetime(2026, 1, 15, 10, 0)
+        )
+        self.calendar.add_event(
+            "Cancelled Meeting",
+            datetime(2026, 1, 15, 11, 0),
+            datetime(2026, 1, 15, 12, 0)
+        )
+        self.calendar.delete_event(2, date(2026, 1, 15))
+        
+        new_calendar = Calendar()
+        
+        self.assertEqual(len(new_calendar.get_events_for_date(date(2026, 1, 15))), 1)
+        self.assertEqual(new_calendar.get_events_for_date(date(2026, 1, 15))[0].title, "Kept Meeting")
+    
+    def test_time_zone_is_kept_after_restart(self):
+        """
+        Test that an event with a time zone reloads with the same time zone.
+        Its date must not shift, even though 21:00 at UTC-05:00 is the next day in UTC.
+        """
+        eastern = timezone(timedelta(hours=-5))
+        start = datetime(2026, 1, 15, 21, 0, tzinfo=eastern)
+        end = datetime(2026, 1, 15, 22, 0, tzinfo=eastern)
+        self.calendar.add_event("Evening Call", start, end)
+        self.calendar.add_event(
+            "Cancelled Call",
+            datetime(2026, 1, 15, 22, 0, tzinfo=eastern),
+            datetime(2026, 1, 15, 23, 0, tzinfo=eastern)
+        )
+        self.calendar.delete_event(2, date(2026, 1, 15))
+        
+        new_calendar = Calendar()
+        
+        events = new_calendar.get_events_for_date(date(2026, 1, 15))
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0].title, "Evening Call")
+        self.assertEqual(events[0].start_time.utcoffset(), timedelta(hours=-5))
+        self.assertEqual(events[0].start_time, start)
+        self.assertEqual(events[0].end_time, end)
+    
+    def test_failed_rewrite_is_retried(self):
+        """
+        Test that a rewrite that fails to write is retried by the next save.
+        A corrupt file must be replaced, not appended to, or its events are lost.
+        """
+        with open(Calendar.DATA_FILE, "w") as file:
+            file.write("not json\n")
+        calendar = Calendar()
+        
+        # A directory in the temporary file's place makes the rewrite fail
+        temp_file = Calendar.DATA_FILE + ".tmp"
+        os.mkdir(temp_file)
+        self.addCleanup(lambda: os.path.isdir(temp_file) and os.rmdir(temp_file))
+        with self.assertRaises(OSError):
+            calendar.add_event("A", datetime(2026, 1, 15, 9, 0), datetime(2026, 1, 15, 10, 0))
+        os.rmdir(temp_file)
+        calendar.add_event("B", datetime(2026, 1, 15, 11, 0), datetime(2026, 1, 15, 12, 0))
+        
+        new_calendar = Calendar()
+        
+        events = new_calendar.get_events_for_date(date(2026, 1, 15))
+        self.assertEqual([event.title for event in events], ["A", "B"])
+    
+    def test_log_is_compacted(self):
+        """Test that the data file is rewritten once most of it is deletions."""
+        for hour in (9, 10, 11):
+            self.calendar.add_event(
+                "Meeting",
+                datetime(2026, 1, 15, hour, 0),
+                datetime(2026, 1, 15, hour, 30)
+            )
+        self.calendar.delete_event(1, date(2026, 1, 15))
+        self.calendar.delete_event(1, date(2026, 1, 15))
+        
+        # 3 additions and 2 deletions were logged, 4 of them dead: compacted to 1 line
+        with open(Calendar.DATA_FILE, "rb") as file:
+            self.assertEqual(len(file.readlines()), 1)
+        self.assertEqual(len(Calendar().get_events_for_date(date(2026, 1, 15))), 1)
+    
+    def test_legacy_json_file_is_converted(self):
+        """Test that a calendar saved as a single JSON array is still loaded."""
+        with open(Calendar.LEGACY_DATA_FILE, "w") as file:
+            file.write('[{"title": "Old Meeting", '
+                       '"start_time": "2026-01-15T09:00:00", '
+                       '"end_time": "2026-01-15T10:00:00"}]')
+        
+        calendar = Calendar()
+        
+        self.assertEqual(len(calendar.get_events_for_date(date(2026, 1, 15))), 1)
+        self.assertEqual(calendar.get_events_for_date(date(2026, 1, 15))[0].title, "Old Meeting")
+        self.assertTrue(os.path.exists(Calendar.DATA_FILE))
+    
+    def test_load_survives_failed_conversion(self):
+        """
+        Test that the calendar still loads when converting a legacy file fails,
+        and that the conversion is retried by the next save.
+        """
+        with open(Calendar.LEGACY_DATA_FILE, "w") as file:
+            file.write('[{"title": "Old Meeting", '
+                       '"start_time": "2026-01-15T09:00:00", '
+                       '"end_time": "2026-01-15T10:00:00"}]')
+        
+        # A directory in the temporary file's place makes the rewrite fail
+        temp_file = Calendar.DATA_FILE + ".tmp"
+        os.mkdir(temp_file)
+        self.addCleanup(lambda: os.path.isdir(temp_file) and os.rmdir(temp_file))
+        calendar = Calendar()
+        self.assertEqual(len(calendar.get_events_for_date(date(2026, 1, 15))), 1)
+        
+        os.rmdir(temp_file)
+        calendar.add_event("New Meeting", datetime(2026, 1, 15, 11, 0), datetime(2026, 1, 15, 12, 0))
+        
+        new_calendar = Calendar()
+        
+        events = new_calendar.get_events_for_date(date(2026, 1, 15))
+        self.assertEqual([event.title for event in events], ["Old Meeting", "New Meeting"])
+
+
+class TestInputParsing(unittest.TestCase):
+    """
+    Tests for parsing the dates and times typed by the user.
+    
+    Each accepted format is checked, including the short forms without
+    leading zeros, along with inputs that must be rejected.
+    """
+    
+    def test_parse_dates_in_each_format(self):
+        """Test MM-DD-YYYY, MM/DD/YYYY and YYYY-MM-DD dates."""
+        self.assertEqual(_parse_date_str("01-15-2027"), date(2027, 1, 15))
+        self.assertEqual(_parse_date_str("01/15/2027"), date(2027, 1, 15))
+        self.assertEqual(_parse_date_str("2027-01-15"), date(2027, 1, 15))
+        self.assertEqual(_parse_date_str("2027-1-5"), date(2027, 1, 5))
+    
+    def test_parse_dates_without_leading_zeros(self):
+        """
+        Test MM-DD-YYYY dates with a one-digit month or day.
+        These have a dash at the same position as a YYYY-MM-DD date.
+        """
+        self.assertEqual(_parse_date_str("1-15-2027"), date(2027, 1, 15))
+        self.assertEqual(_parse_date_str("01-5-2027"), date(2027, 1, 5))
+        self.assertEqual(_parse_date_str("12-1-2027"), date(2027, 12, 1))
+        self.assertEqual(_parse_date_str("1/5/2027"), date(2027, 1, 5))
+    
+    def test_parse_invalid_dates(self):
+        """Test that malformed or impossible dates are rejected."""
+        self.assertIsNone(_parse_date_str("13-01-2027"))
+        self.assertIsNone(_parse_date_str("02-30-2027"))
+        self.assertIsNone(_parse_date_str("2027/01/15"))
+        self.assertIsNone(_parse_date_str("tomorrow"))
+    
+    def test_parse_12_hour_times(self):
+        """Test times with AM/PM, with and without minutes and spaces."""
+        self.assertEqual(_parse_time_str("2:30 PM"), (14, 30))
+        self.assertEqual(_parse_time_str("2:30pm"), (14, 30))
+        self.assertEqual(_parse_time_str("9 AM"), (9, 0))
+        self.assertEqual(_parse_time_str("9am"), (9, 0))
+        self.assertEqual(_parse_time_str("12:15 AM"), (0, 15))
+        self.assertEqual(_parse_time_str("12 PM"), (12, 0))
+    
+    def test_parse_24_hour_times(self):
+        """Test times on the 24-hour clock."""
+        self.assertEqual(_parse_time_str("14:30"), (14, 30))
+        self.assertEqual(_parse_time_str("0:05"), (0, 5))
+        self.assertEqual(_parse_time_str("23:59"), (23, 59))
+    
+    def test_parse_invalid_times(self):
+        """Test that out-of-range or malformed times are rejected."""
+        self.assertIsNone(_parse_time_str("13:00 PM"))
+        self.assertIsNone(_parse_time_str("0:30 AM"))
+        self.assertIsNone(_parse_time_str("24:00"))
+        self.assertIsNone(_parse_time_str("9:60"))
+        self.assertIsNone(_parse_time_str("14"))
+        self.assertIsNone(_parse_time_str("noon"))
 
 
 # This allows running the tests directly with: python test_calendar.py